@@ -5,11 +5,57 @@ Converts natural language commands to shell commands using LLM
 """
 
 import os
+import re
 import json
-import requests
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from config import PyTerminalConfig
 
+# Upper bound on simultaneous LLM requests (matches the HTTP pool size)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Number of interpreted commands remembered per interpreter
+CACHE_SIZE = 512
+
+# Most commands sent in one batched prompt; larger batches slow responses down
+BATCH_SIZE = 8
+
+# Completion token ceiling for one request (gpt-3.5-turbo's limit is the lowest)
+MAX_COMPLETION_TOKENS = 4096
+
+# Matches the "N)", "N." or "N:" markers that open each answer in a batched reply
+_BATCH_MARKER_RE = re.compile(r'^[ \t]*(\d+)[).:](?=\s|$)[ \t]*', re.MULTILINE)
+
+# A non-blank response line without surrounding whitespace, and its first word
+_COMMAND_LINE_RE = re.compile(r'^[ \t]*((\S+)[^\r\n]*?)[ \t]*\r?$', re.MULTILINE)
+
+# Keyword groups recognised by the offline fallback interpreter. Keywords only
+# have to start a word, so plurals and compounds ("disks", "filesystem") match;
+# "processor" is listed before "process" so it is classified as cpu
+_FALLBACK_INTENT_RE = re.compile(
+    r'\b(?:'
+    r'(?P<create>create|make|new)'
+    r'|(?P<show>show|display|list)'
+    r'|(?P<folder>folder|directory)'
+    r'|(?P<files>file)'
+    r'|(?P<cpu>cpu|processor)'
+    r'|(?P<mem>memory|ram)'
+    r'|(?P<ps>process)'
+    r'|(?P<disk>disk|storage)'
+    r')'
+)
+
+# Command produced for each "show" intent, in priority order
+_FALLBACK_COMMANDS = {
+    'files': 'ls',
+    'cpu': 'cpu',
+    'mem': 'mem',
+    'ps': 'ps',
+    'disk': 'disk',
+}
+
 class AIInterpreter:
     """AI-driven natural language command interpreter using LLM"""
     
@@ -49,6 +95,48 @@ class AIInterpreter:
             'clear': 'Clear screen',
             'exit': 'Exit terminal'
         }
+        
+        self._cmd_set = frozenset(self.available_commands)
+        
+        # The prompt only depends on available_commands, so build it once
+        self._system_prompt = self._build_system_prompt()
+        
+        # Reuse one pooled session so repeated calls skip the TCP/TLS handshake;
+        # it is created on the first LLM call so offline use never imports requests
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # LRU cache of normalized command -> interpreted commands
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def _get_session(self):
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self):
+        """Create a keep-alive HTTP session with the static LLM headers"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        session.headers.update({
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive'
+        })
+        # Google AI takes the key as a query parameter instead of a header
+        if self.api_key and not self.api_key.startswith('AIza'):
+            session.headers['Authorization'] = f'Bearer {self.api_key}'
+        
+        return session
     
     def interpret(self, command: str) -> Optional[List[str]]:
         """
@@ -57,54 +145,184 @@ class AIInterpreter:
         if not self.api_key:
             return self._fallback_interpret(command)
         
+        key = self._cache_key(command)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return list(cached)
+        
         try:
-            return self._llm_interpret(command)
+            commands = self._llm_interpret(command)
         except Exception as e:
             print(f"LLM interpretation failed: {str(e)}")
             return self._fallback_interpret(command)
+        
+        if commands:
+            self._cache_put(key, commands)
+        return commands
+    
+    @staticmethod
+    def _cache_key(command: str) -> str:
+        """Normalize a command for the cache, keeping case for file names"""
+        return " ".join(command.split())
+    
+    def _cache_get(self, key: str) -> Optional[tuple]:
+        """Look up an interpreted command, marking it most recently used"""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+            return cached
+    
+    def _cache_put(self, key: str, commands: List[str]):
+        """Store an interpreted command, evicting the least recently used"""
+        with self._cache_lock:
+            self._cache[key] = tuple(commands)
+            self._cache.move_to_end(key)
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def interpret_many(self, commands: List[str]) -> List[Optional[List[str]]]:
+        """
+        Interpret several natural language commands with as few LLM calls as possible
+        
+        Uncached commands are grouped into batched prompts of up to BATCH_SIZE
+        commands and the batches are sent concurrently. Results are returned
+        in the same order as the input commands.
+        """
+        if not self.api_key:
+            return [self._fallback_interpret(command) for command in commands]
+        
+        results: List[Optional[List[str]]] = [None] * len(commands)
+        pending = []
+        for index, command in enumerate(commands):
+            cached = self._cache_get(self._cache_key(command))
+            if cached is not None:
+                results[index] = list(cached)
+            else:
+                pending.append(index)
+        
+        if not pending:
+            return results
+        
+        batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+        
+        # The LLM calls are network bound, so threads overlap their round trips
+        workers = min(len(batches), MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batch_results = executor.map(
+                self._interpret_batch,
+                [[commands[index] for index in batch] for batch in batches]
+            )
+            for batch, interpreted in zip(batches, batch_results):
+                for index, result in zip(batch, interpreted):
+                    results[index] = result
+        
+        return results
+    
+    def _interpret_batch(self, commands: List[str]) -> List[Optional[List[str]]]:
+        """Interpret a batch of uncached commands, falling back on failure"""
+        if len(commands) == 1:
+            return [self.interpret(commands[0])]
+        
+        try:
+            interpreted = self._llm_interpret_batch(commands)
+        except Exception as e:
+            print(f"LLM interpretation failed: {str(e)}")
+            return [self._fallback_interpret(command) for command in commands]
+        
+        for index, (command, result) in enumerate(zip(commands, interpreted)):
+            if result:
+                self._cache_put(self._cache_key(command), result)
+            else:
+                # The reply had no usable answer for this command; ask for it alone
+                interpreted[index] = self.interpret(command)
+        return interpreted
     
     def _llm_interpret(self, command: str) -> Optional[List[str]]:
         """Use LLM to interpret natural language command"""
-        system_prompt = self._create_system_prompt()
         user_prompt = f"Convert this natural language command to PyTerminal shell commands: '{command}'"
+        content = self._llm_complete(user_prompt, self.config.max_tokens)
+        return self._parse_llm_response(content)
+    
+    def _llm_interpret_batch(self, commands: List[str]) -> List[Optional[List[str]]]:
+        """Use a single LLM request to interpret several natural language commands"""
+        numbered = "\n".join(f"{i}) {command}" for i, command in enumerate(commands, 1))
+        user_prompt = (
+            "Convert each of the following natural language commands to PyTerminal shell commands. "
+            "Start each answer with its number followed by ')' on its own line, "
+            "then put that answer's commands on the following lines:\n"
+            f"{numbered}"
+        )
+        max_tokens = min(self.config.max_tokens * len(commands), MAX_COMPLETION_TOKENS)
+        content = self._llm_complete(user_prompt, max_tokens)
+        return self._parse_batch_response(content, len(commands))
+    
+    def _llm_complete(self, user_prompt: str, max_tokens: int) -> str:
+        """Send a prompt to the configured LLM and return the raw reply text"""
+        system_prompt = self._create_system_prompt()
         
         # Check if this is a Google AI API
         if self.api_key.startswith('AIza'):
-            return self._google_ai_interpret(system_prompt, user_prompt)
+            return self._google_ai_complete(system_prompt, user_prompt, max_tokens)
         else:
-            return self._openai_interpret(system_prompt, user_prompt)
+            return self._openai_complete(system_prompt, user_prompt, max_tokens)
     
-    def _openai_interpret(self, system_prompt: str, user_prompt: str) -> Optional[List[str]]:
+    def _openai_complete(self, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
         """Use OpenAI API"""
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
-        }
-        
         data = {
             'model': self.model,
             'messages': [
                 {'role': 'system', 'content': system_prompt},
                 {'role': 'user', 'content': user_prompt}
             ],
-            'max_tokens': self.config.max_tokens,
-            'temperature': self.config.temperature
+            'max_tokens': max_tokens,
+            'temperature': self.config.temperature,
+            'stream': True
         }
         
-        response = requests.post(self.api_url, headers=headers, json=data, timeout=10)
-        response.raise_for_status()
+        # Stream the reply so a refusal can be cut off as soon as it starts
+        response = self._get_session().post(self.api_url, json=data, timeout=10, stream=True)
+        with response:
+            response.raise_for_status()
+            
+            # Compatible endpoints may ignore 'stream' and send a plain JSON reply
+            if not response.headers.get('Content-Type', '').startswith('text/event-stream'):
+                result = response.json()
+                return result['choices'][0]['message']['content'].strip()
+            
+            return self._read_openai_stream(response)
+    
+    def _read_openai_stream(self, response) -> str:
+        """Collect a streamed OpenAI reply, stopping early if it starts with ERROR:"""
+        content = []
+        checked = False
         
-        result = response.json()
-        content = result['choices'][0]['message']['content'].strip()
+        for raw_line in response.iter_lines():
+            # Server-sent events: payload lines look like "data: {...}"
+            line = raw_line.decode('utf-8')
+            if not line.startswith('data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == '[DONE]':
+                break
+            
+            choices = json.loads(payload).get('choices')
+            if not choices:
+                continue
+            content.append(choices[0].get('delta', {}).get('content') or '')
+            
+            if not checked:
+                head = ''.join(content).lstrip()
+                if len(head) >= len('ERROR:'):
+                    checked = True
+                    if head.startswith('ERROR:'):
+                        # Closing the response aborts the rest of the generation
+                        break
         
-        return self._parse_llm_response(content)
+        return ''.join(content).strip()
     
-    def _google_ai_interpret(self, system_prompt: str, user_prompt: str) -> Optional[List[str]]:
+    def _google_ai_complete(self, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
         """Use Google AI API"""
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        
         # Google AI API uses different format
         full_prompt = f"{system_prompt}\n\n{user_prompt}"
         
@@ -113,7 +331,7 @@ class AIInterpreter:
                 'parts': [{'text': full_prompt}]
             }],
             'generationConfig': {
-                'maxOutputTokens': self.config.max_tokens,
+                'maxOutputTokens': max_tokens,
                 'temperature': self.config.temperature
             }
         }
@@ -121,16 +339,18 @@ class AIInterpreter:
         # Add API key as query parameter for Google AI
         url = f"{self.api_url}?key={self.api_key}"
         
-        response = requests.post(url, headers=headers, json=data, timeout=10)
+        response = self._get_session().post(url, json=data, timeout=10)
         response.raise_for_status()
         
         result = response.json()
-        content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-        
-        return self._parse_llm_response(content)
+        return result['candidates'][0]['content']['parts'][0]['text'].strip()
     
     def _create_system_prompt(self) -> str:
-        """Create system prompt for the LLM"""
+        """Return the cached system prompt for the LLM"""
+        return self._system_prompt
+    
+    def _build_system_prompt(self) -> str:
+        """Build system prompt for the LLM"""
         commands_desc = "\n".join([f"  {cmd}: {desc}" for cmd, desc in self.available_commands.items()])
         
         return f"""You are a helpful assistant that converts natural language commands to PyTerminal shell commands.
@@ -166,43 +386,48 @@ Return only the shell commands:"""
         if response.startswith("ERROR:"):
             return None
         
-        lines = response.strip().split('\n')
-        commands = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#') and not line.startswith('//'):
-                # Extract command (first word should be a valid command)
-                parts = line.split()
-                if parts and parts[0] in self.available_commands:
-                    commands.append(line)
+        # One regex pass yields each stripped line with its first word; the
+        # word must be a valid command, which also rejects '#'/'//' comments
+        cmd_set = self._cmd_set
+        commands = [
+            match.group(1)
+            for match in _COMMAND_LINE_RE.finditer(response)
+            if match.group(2) in cmd_set
+        ]
         
         return commands if commands else None
     
+    def _parse_batch_response(self, response: str, count: int) -> List[Optional[List[str]]]:
+        """Split a batched LLM reply on its numbered markers and parse each answer"""
+        results: List[Optional[List[str]]] = [None] * count
+        markers = list(_BATCH_MARKER_RE.finditer(response))
+        
+        for marker, next_marker in zip(markers, markers[1:] + [None]):
+            index = int(marker.group(1)) - 1
+            if 0 <= index < count:
+                end = next_marker.start() if next_marker else len(response)
+                results[index] = self._parse_llm_response(response[marker.end():end].strip())
+        
+        return results
+    
     def _fallback_interpret(self, command: str) -> Optional[List[str]]:
         """Fallback interpretation using simple patterns when LLM is not available"""
         command = command.lower().strip()
         
-        # Simple pattern matching as fallback
-        if any(word in command for word in ['create', 'make', 'new']):
-            if any(word in command for word in ['folder', 'directory']):
-                # Extract folder name
-                words = command.split()
-                for i, word in enumerate(words):
-                    if word in ['folder', 'directory'] and i + 1 < len(words):
-                        folder_name = words[i + 1]
-                        return [f"mkdir {folder_name}"]
-        
-        if any(word in command for word in ['show', 'display', 'list']):
-            if any(word in command for word in ['file', 'files']):
-                return ["ls"]
-            elif any(word in command for word in ['cpu', 'processor']):
-                return ["cpu"]
-            elif any(word in command for word in ['memory', 'ram']):
-                return ["mem"]
-            elif any(word in command for word in ['process', 'processes']):
-                return ["ps"]
-            elif any(word in command for word in ['disk', 'storage']):
-                return ["disk"]
+        # Classify the command in a single regex pass
+        intents = {match.lastgroup for match in _FALLBACK_INTENT_RE.finditer(command)}
+        
+        if 'create' in intents and 'folder' in intents:
+            # Extract folder name
+            words = command.split()
+            for i, word in enumerate(words):
+                if word in ('folder', 'directory') and i + 1 < len(words):
+                    folder_name = words[i + 1]
+                    return [f"mkdir {folder_name}"]
+        
+        if 'show' in intents:
+            for intent, shell_command in _FALLBACK_COMMANDS.items():
+                if intent in intents:
+                    return [shell_command]
         
         return None
@@ -5,13 +5,23 @@ Handles all terminal commands and their execution
 """
 
 import os
+import errno
+import heapq
 import shutil
-import subprocess
-import psutil
+import time
 from pathlib import Path
 from typing import List, Tuple, Callable, Dict, Any
 import stat
 
+# Seconds the cached disk partition list stays valid
+PARTITIONS_TTL = 30.0
+
+# Minimum bytes requested per copy_file_range call in cp
+COPY_BLOCK_SIZE = 8 * 1024 * 1024
+
+# copy_file_range errors that mean "not supported here" rather than a real failure
+COPY_FALLBACK_ERRNOS = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM)
+
 class CommandRegistry:
     """Registry for managing and executing terminal commands"""
     
@@ -36,53 +46,65 @@ class CommandRegistry:
             'ps': self._cmd_ps,
             'disk': self._cmd_disk,
         }
+        
+        # Bound lookup so execute() resolves a command with one dict probe
+        self._dispatch = self.commands.get
+        
+        # psutil is imported on first use by the monitoring commands; the
+        # CPU count is read then too, since it does not change in a session
+        self._cpu_count = None
+        self._partitions = None
+        self._partitions_time = 0.0
+    
+    @staticmethod
+    def _resolve(current_dir: str, path: str) -> str:
+        """Resolve a command argument against the current directory"""
+        # os.path.join already keeps absolute paths as they are
+        return os.path.join(current_dir, path)
     
     def execute(self, command: str, args: List[str], current_dir: str) -> Tuple[bool, str]:
         """Execute a command with given arguments"""
-        if command not in self.commands:
+        handler = self._dispatch(command)
+        if handler is None:
             return False, f"Command '{command}' not found. Type 'help' for available commands."
         
         try:
-            return self.commands[command](args, current_dir)
+            return handler(args, current_dir)
         except Exception as e:
             return False, f"Error executing '{command}': {str(e)}"
     
     def _cmd_ls(self, args: List[str], current_dir: str) -> Tuple[bool, str]:
         """List files and directories"""
-        path = args[0] if args else current_dir
-        
-        # Handle relative paths
-        if not os.path.isabs(path):
-            path = os.path.join(current_dir, path)
+        path = self._resolve(current_dir, args[0]) if args else current_dir
         
         try:
-            if not os.path.exists(path):
-                return False, f"ls: cannot access '{path}': No such file or directory"
-            
-            if not os.path.isdir(path):
-                return False, f"ls: cannot access '{path}': Not a directory"
+            # scandir entries carry their own names and cached stat data, so
+            # no per-item path joins are needed
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
             
-            items = os.listdir(path)
-            if not items:
+            if not entries:
                 return True, ""
             
             # Format output similar to ls -la
             output_lines = []
-            for item in sorted(items):
-                item_path = os.path.join(path, item)
+            for entry in entries:
                 try:
-                    stat_info = os.stat(item_path)
+                    stat_info = entry.stat()
                     mode = stat.filemode(stat_info.st_mode)
                     size = stat_info.st_size
-                    modified = stat_info.st_mtime
                     
                     # Format permissions, size, and name
-                    output_lines.append(f"{mode} {size:8d} {item}")
+                    output_lines.append(f"{mode} {size:8d} {entry.name}")
                 except OSError:
-                    output_lines.append(f"????????? {item}")
+                    output_lines.append(f"????????? {entry.name}")
             
             return True, "\n".join(output_lines)
         
+        except FileNotFoundError:
+            return False, f"ls: cannot access '{path}': No such file or directory"
+        except NotADirectoryError:
+            return False, f"ls: cannot access '{path}': Not a directory"
         except PermissionError:
             return False, f"ls: cannot open directory '{path}': Permission denied"
         except Exception as e:
@@ -94,11 +116,7 @@ class CommandRegistry:
             # Go to home directory
             new_dir = os.path.expanduser("~")
         else:
-            path = args[0]
-            if not os.path.isabs(path):
-                new_dir = os.path.join(current_dir, path)
-            else:
-                new_dir = path
+            new_dir = self._resolve(current_dir, args[0])
         
         try:
             if not os.path.exists(new_dir):
@@ -126,10 +144,7 @@ class CommandRegistry:
             return False, "mkdir: missing operand"
         
         for dir_name in args:
-            if not os.path.isabs(dir_name):
-                dir_path = os.path.join(current_dir, dir_name)
-            else:
-                dir_path = dir_name
+            dir_path = self._resolve(current_dir, dir_name)
             
             try:
                 os.makedirs(dir_path, exist_ok=True)
@@ -148,32 +163,29 @@ class CommandRegistry:
             return False, "rm: missing operand"
         
         for item in args:
-            if not os.path.isabs(item):
-                item_path = os.path.join(current_dir, item)
-            else:
-                item_path = item
+            item_path = self._resolve(current_dir, item)
             
+            # Try the common file case first and let the OS report
+            # directories, missing paths and non-empty directories
             try:
-                if not os.path.exists(item_path):
-                    return False, f"rm: cannot remove '{item}': No such file or directory"
-                
-                if os.path.isdir(item_path):
-                    # Safety check for directories
-                    try:
-                        # Check if directory is empty
-                        if os.listdir(item_path):
-                            return False, f"rm: cannot remove '{item}': Directory not empty (use 'rm -r' for recursive removal)"
-                    except OSError:
-                        pass
-                    
+                try:
+                    os.unlink(item_path)
+                except IsADirectoryError:
                     # For empty directories, use rmdir
                     os.rmdir(item_path)
-                else:
-                    os.remove(item_path)
+                except PermissionError:
+                    # macOS and Windows reject unlink() on directories this way
+                    if not os.path.isdir(item_path):
+                        raise
+                    os.rmdir(item_path)
             
+            except FileNotFoundError:
+                return False, f"rm: cannot remove '{item}': No such file or directory"
             except PermissionError:
                 return False, f"rm: cannot remove '{item}': Permission denied"
             except OSError as e:
+                if e.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                    return False, f"rm: cannot remove '{item}': Directory not empty (use 'rm -r' for recursive removal)"
                 return False, f"rm: {str(e)}"
         
         return True, ""
@@ -183,23 +195,24 @@ class CommandRegistry:
         if not args:
             return False, "cat: missing operand"
         
-        file_path = args[0]
-        if not os.path.isabs(file_path):
-            file_path = os.path.join(current_dir, file_path)
+        file_path = self._resolve(current_dir, args[0])
         
+        # Let open() report missing files and directories instead of
+        # stat-ing the path twice up front
         try:
-            if not os.path.exists(file_path):
-                return False, f"cat: {file_path}: No such file or directory"
-            
-            if not os.path.isfile(file_path):
-                return False, f"cat: {file_path}: Is a directory"
-            
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             return True, content
         
+        except FileNotFoundError:
+            return False, f"cat: {file_path}: No such file or directory"
+        except IsADirectoryError:
+            return False, f"cat: {file_path}: Is a directory"
         except PermissionError:
+            # Windows reports directories as PermissionError
+            if os.path.isdir(file_path):
+                return False, f"cat: {file_path}: Is a directory"
             return False, f"cat: {file_path}: Permission denied"
         except Exception as e:
             return False, f"cat: {str(e)}"
@@ -210,10 +223,7 @@ class CommandRegistry:
             return False, "touch: missing operand"
         
         for file_name in args:
-            if not os.path.isabs(file_name):
-                file_path = os.path.join(current_dir, file_name)
-            else:
-                file_path = file_name
+            file_path = self._resolve(current_dir, file_name)
             
             try:
                 Path(file_path).touch()
@@ -227,40 +237,82 @@ class CommandRegistry:
         if len(args) < 2:
             return False, "cp: missing file operand"
         
-        src = args[0]
-        dest = args[1]
-        
-        if not os.path.isabs(src):
-            src = os.path.join(current_dir, src)
-        if not os.path.isabs(dest):
-            dest = os.path.join(current_dir, dest)
+        src = self._resolve(current_dir, args[0])
+        dest = self._resolve(current_dir, args[1])
         
         try:
             if os.path.isdir(src):
-                shutil.copytree(src, dest)
+                shutil.copytree(src, dest, copy_function=self._copy_file)
             else:
-                shutil.copy2(src, dest)
+                self._copy_file(src, dest)
             
             return True, ""
         
         except Exception as e:
             return False, f"cp: {str(e)}"
     
+    def _copy_file(self, src: str, dest: str) -> str:
+        """Copy a file with copy_file_range where available, like shutil.copy2"""
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, os.path.basename(src))
+        
+        if not hasattr(os, 'copy_file_range'):
+            return shutil.copy2(src, dest)
+        
+        # Opening dest for writing would truncate src if they are the same file
+        if os.path.exists(dest) and os.path.samefile(src, dest):
+            raise shutil.SameFileError(f"{src!r} and {dest!r} are the same file")
+        
+        try:
+            with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+                # The kernel copies the data (or reflinks it on btrfs/XFS)
+                # without passing it through user space
+                size = os.fstat(fsrc.fileno()).st_size
+                blocksize = min(max(size, COPY_BLOCK_SIZE), 2 ** 30)
+                copied = size and os.copy_file_range(fsrc.fileno(), fdst.fileno(), blocksize)
+                if copied:
+                    while os.copy_file_range(fsrc.fileno(), fdst.fileno(), blocksize):
+                        pass
+        except OSError as e:
+            if e.errno not in COPY_FALLBACK_ERRNOS:
+                raise
+            # File system or kernel cannot do it, use a regular copy instead
+            return shutil.copy2(src, dest)
+        
+        if not copied:
+            # procfs/sysfs report a size of 0, and some file systems (or
+            # cross-device copies on older kernels) copy nothing, so read
+            # the data through user space instead of leaving dest empty
+            return shutil.copy2(src, dest)
+        
+        shutil.copystat(src, dest)
+        return dest
+    
     def _cmd_mv(self, args: List[str], current_dir: str) -> Tuple[bool, str]:
         """Move/rename file or directory"""
         if len(args) < 2:
             return False, "mv: missing file operand"
         
-        src = args[0]
-        dest = args[1]
+        src = self._resolve(current_dir, args[0])
+        dest = self._resolve(current_dir, args[1])
         
-        if not os.path.isabs(src):
-            src = os.path.join(current_dir, src)
-        if not os.path.isabs(dest):
-            dest = os.path.join(current_dir, dest)
+        # Moving into an existing directory keeps the source name
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, os.path.basename(src.rstrip(os.sep)))
+            # Like shutil.move, never replace an entry already in the directory
+            if os.path.exists(dest):
+                return False, f"mv: destination '{dest}' already exists"
         
         try:
-            shutil.move(src, dest)
+            try:
+                # Same file system: a single rename syscall
+                os.rename(src, dest)
+            except OSError as e:
+                # Cross-device moves, and overwrites on Windows, need
+                # shutil's copy-and-delete path
+                if e.errno != errno.EXDEV and not isinstance(e, FileExistsError):
+                    raise
+                shutil.move(src, dest)
             return True, ""
         
         except Exception as e:
@@ -272,10 +324,7 @@ class CommandRegistry:
             return False, "rmdir: missing operand"
         
         for dir_name in args:
-            if not os.path.isabs(dir_name):
-                dir_path = os.path.join(current_dir, dir_name)
-            else:
-                dir_path = dir_name
+            dir_path = self._resolve(current_dir, dir_name)
             
             try:
                 if not os.path.exists(dir_path):
@@ -296,33 +345,38 @@ class CommandRegistry:
         if not args:
             return True, ""
         
-        # Join all arguments with spaces
-        text = " ".join(args)
+        # Plain echo is the common case, so only look for redirection
+        # when some argument actually contains '>'
+        if not any(">" in arg for arg in args):
+            return True, " ".join(args)
         
         # Handle redirection (simple > filename)
-        if ">" in text:
-            parts = text.split(">", 1)
-            if len(parts) == 2:
-                content = parts[0].strip()
-                filename = parts[1].strip()
-                
-                if not os.path.isabs(filename):
-                    filename = os.path.join(current_dir, filename)
-                
-                try:
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    return True, ""
-                except Exception as e:
-                    return False, f"echo: {str(e)}"
+        content, _, filename = " ".join(args).partition(">")
+        content = content.strip()
+        filename = filename.strip()
+        
+        filename = self._resolve(current_dir, filename)
         
-        return True, text
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(content)
+            return True, ""
+        except Exception as e:
+            return False, f"echo: {str(e)}"
     
     def _cmd_cpu(self, args: List[str], current_dir: str) -> Tuple[bool, str]:
         """Show CPU usage"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
+            import psutil
+            
+            if self._cpu_count is None:
+                # First call: no previous sample yet, so take a short one
+                self._cpu_count = psutil.cpu_count()
+                cpu_percent = psutil.cpu_percent(interval=0.1)
+            else:
+                # Usage since the previous sample instead of sleeping
+                cpu_percent = psutil.cpu_percent(interval=None)
+            cpu_count = self._cpu_count
             cpu_freq = psutil.cpu_freq()
             
             output = f"CPU Usage: {cpu_percent}%\n"
@@ -338,6 +392,8 @@ class CommandRegistry:
     def _cmd_mem(self, args: List[str], current_dir: str) -> Tuple[bool, str]:
         """Show memory usage"""
         try:
+            import psutil
+            
             memory = psutil.virtual_memory()
             swap = psutil.swap_memory()
             
@@ -355,6 +411,8 @@ class CommandRegistry:
     def _cmd_ps(self, args: List[str], current_dir: str) -> Tuple[bool, str]:
         """List running processes"""
         try:
+            import psutil
+            
             processes = []
             for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
                 try:
@@ -363,13 +421,13 @@ class CommandRegistry:
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
-            # Sort by PID
-            processes.sort(key=lambda x: x['pid'])
+            # Only the lowest 20 PIDs are shown, so skip sorting the whole table
+            lowest = heapq.nsmallest(20, processes, key=lambda x: x['pid'])
             
             output = f"{'PID':<8} {'Name':<20} {'CPU%':<8} {'Memory%':<10}\n"
             output += "-" * 50 + "\n"
             
-            for proc in processes[:20]:  # Show first 20 processes
+            for proc in lowest:
                 output += f"{proc['pid']:<8} {proc['name']:<20} {proc['cpu_percent']:<8.1f} {proc['memory_percent']:<10.1f}\n"
             
             if len(processes) > 20:
@@ -380,11 +438,22 @@ class CommandRegistry:
         except Exception as e:
             return False, f"ps: {str(e)}"
     
+    def _get_partitions(self) -> list:
+        """Return disk partitions, refreshing the cached list after PARTITIONS_TTL"""
+        now = time.monotonic()
+        if self._partitions is None or now - self._partitions_time > PARTITIONS_TTL:
+            import psutil
+            self._partitions = psutil.disk_partitions()
+            self._partitions_time = now
+        return self._partitions
+    
     def _cmd_disk(self, args: List[str], current_dir: str) -> Tuple[bool, str]:
         """Show disk usage"""
         try:
+            import psutil
+            
             disk_usage = psutil.disk_usage('/')
-            partitions = psutil.disk_partitions()
+            partitions = self._get_partitions()
             
             output = f"Disk Usage (Root):\n"
             output += f"Total: {disk_usage.total / (1024**3):.2f} GB\n"
@@ -5,14 +5,7 @@ Handles API keys and settings
 """
 
 import os
-from typing import Optional
-
-# Try to import dotenv for .env file support
-try:
-    from dotenv import load_dotenv
-    HAS_DOTENV = True
-except ImportError:
-    HAS_DOTENV = False
+from typing import Dict, Optional
 
 class PyTerminalConfig:
     """Configuration management for PyTerminal"""
@@ -21,51 +14,75 @@ class PyTerminalConfig:
         # Load .env file if available
         self._load_env_file()
         
+        # Parse ~/.pyterminal_config once and reuse it for every setting
+        self._file_config = self._read_config_file()
+        
         self.api_key = self._get_api_key()
         
+        # The model and endpoint saved with a key only apply to that key
+        if self.api_key and self.api_key == self._file_config.get('API_KEY'):
+            saved = self._file_config
+        else:
+            saved = {}
+        
+        # Read the environment mapping directly instead of one getenv per setting
+        env = os.environ
+        
         # Auto-detect API type based on key format
         if self.api_key and self.api_key.startswith('AIza'):
             # Google AI API key
-            self.model = os.getenv('PYTERMINAL_MODEL', 'gemini-1.5-flash')
-            self.api_url = os.getenv('PYTERMINAL_API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent')
+            self.model = env.get('PYTERMINAL_MODEL', saved.get('MODEL', 'gemini-1.5-flash'))
+            self.api_url = env.get('PYTERMINAL_API_URL', saved.get('API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent'))
         else:
             # Default to OpenAI
-            self.model = os.getenv('PYTERMINAL_MODEL', 'gpt-3.5-turbo')
-            self.api_url = os.getenv('PYTERMINAL_API_URL', 'https://api.openai.com/v1/chat/completions')
-        self.max_tokens = int(os.getenv('PYTERMINAL_MAX_TOKENS', '500'))
-        self.temperature = float(os.getenv('PYTERMINAL_TEMPERATURE', '0.1'))
+            self.model = env.get('PYTERMINAL_MODEL', saved.get('MODEL', 'gpt-3.5-turbo'))
+            self.api_url = env.get('PYTERMINAL_API_URL', saved.get('API_URL', 'https://api.openai.com/v1/chat/completions'))
+        self.max_tokens = int(env.get('PYTERMINAL_MAX_TOKENS', '500'))
+        self.temperature = float(env.get('PYTERMINAL_TEMPERATURE', '0.1'))
     
     def _load_env_file(self):
         """Load .env file if available"""
-        if HAS_DOTENV:
-            # Try to load from current directory
-            if os.path.exists('.env'):
-                load_dotenv('.env')
-            # Also try to load from home directory
-            elif os.path.exists(os.path.expanduser('~/.env')):
-                load_dotenv(os.path.expanduser('~/.env'))
+        # Try to import dotenv for .env file support
+        try:
+            from dotenv import load_dotenv
+        except ImportError:
+            return
+        
+        # Try to load from current directory
+        if os.path.exists('.env'):
+            load_dotenv('.env')
+        # Also try to load from home directory
+        elif os.path.exists(os.path.expanduser('~/.env')):
+            load_dotenv(os.path.expanduser('~/.env'))
     
     def _get_api_key(self) -> Optional[str]:
         """Get API key from various sources"""
         # Check environment variables (including from .env file)
-        api_key = (os.getenv('OPENAI_API_KEY') or 
-                  os.getenv('LLM_API_KEY') or 
-                  os.getenv('API_KEY'))  # Support your specific variable name
+        env = os.environ
+        api_key = (env.get('OPENAI_API_KEY') or 
+                  env.get('LLM_API_KEY') or 
+                  env.get('API_KEY'))  # Support your specific variable name
         if api_key:
             return api_key
         
-        # Check for config file
+        # Fall back to the config file
+        return self._file_config.get('API_KEY')
+    
+    def _read_config_file(self) -> Dict[str, str]:
+        """Read KEY=value settings from ~/.pyterminal_config"""
         config_file = os.path.expanduser('~/.pyterminal_config')
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r') as f:
-                    for line in f:
-                        if line.startswith('API_KEY='):
-                            return line.split('=', 1)[1].strip()
-            except Exception:
-                pass
+        try:
+            with open(config_file, 'r') as f:
+                data = f.read()
+        except (OSError, UnicodeDecodeError):
+            return {}
         
-        return None
+        settings = {}
+        for line in data.splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                settings[key.strip()] = value.strip()
+        return settings
     
     def save_api_key(self, api_key: str) -> bool:
         """Save API key to config file"""
@@ -16,7 +16,8 @@ def main():
     print("-" * 50)
     
     # Get API key from environment or user input
-    api_key = os.getenv('OPENAI_API_KEY') or os.getenv('LLM_API_KEY')
+    env = os.environ
+    api_key = env.get('OPENAI_API_KEY') or env.get('LLM_API_KEY')
     if not api_key:
         print("Note: AI interpreter requires an API key. Set OPENAI_API_KEY environment variable.")
     
@@ -5,6 +5,7 @@ Handles initial project setup and environment configuration
 """
 
 import os
+import re
 import sys
 import subprocess
 
@@ -17,11 +18,63 @@ def check_python_version():
     print(f"✅ Python version: {sys.version.split()[0]}")
     return True
 
+def _version_tuple(version):
+    """Turn a version string like '5.9.0' into a comparable tuple of ints"""
+    return tuple(int(re.match(r'\d*', part).group() or 0) for part in version.split('.'))
+
+def missing_requirements(path="requirements.txt"):
+    """
+    Return the requirements that are not installed at a sufficient version
+    
+    Uses installed package metadata instead of running pip. Returns None when
+    that cannot be checked, so the caller should just run pip.
+    """
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return None
+    
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    
+    missing = []
+    for line in lines:
+        requirement = line.split('#', 1)[0].strip()
+        if not requirement:
+            continue
+        
+        # Only 'name' and 'name>=x.y' are understood; anything else is
+        # reported missing so pip resolves it
+        name, _, minimum = requirement.partition('>=')
+        try:
+            installed = version(name.strip())
+        except PackageNotFoundError:
+            missing.append(requirement)
+            continue
+        
+        if minimum and _version_tuple(installed) < _version_tuple(minimum.strip()):
+            missing.append(requirement)
+
+    return missing
+
 def install_dependencies():
     """Install required Python packages"""
+    # Checking metadata is instant, while starting pip takes a while
+    if missing_requirements() == []:
+        print("\n✅ Dependencies already installed")
+        return True
+    
     print("\n📦 Installing dependencies...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # One pip run for every requirement; skip pip's self-update check,
+        # which costs an extra network round trip on each install
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install", "-r", "requirements.txt",
+            "--disable-pip-version-check", "--no-input"
+        ])
         print("✅ Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -4,14 +4,9 @@ PyTerminal - Core terminal implementation
 Handles command processing, execution, and user interface
 """
 
+import io
 import os
-import sys
-import subprocess
-import shutil
-import psutil
-import glob
-from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from commands import CommandRegistry
 from ai_interpreter import AIInterpreter
 
@@ -22,16 +17,47 @@ try:
 except ImportError:
     HAS_READLINE = False
 
+# Maximum number of commands kept in the history file
+HISTORY_LENGTH = 1000
+
 class PyTerminal:
     """Main terminal class that handles command processing and execution"""
     
     def __init__(self, ai_api_key: str = None):
+        # The prompt's user and host names do not change during a session
+        self._username = os.getenv('USERNAME', 'user')
+        self._hostname = os.getenv('COMPUTERNAME', 'pyterminal')
         self.current_dir = os.getcwd()
         self.command_registry = CommandRegistry()
+        # The registry is fixed after construction, so snapshot its names once
+        self._command_names = tuple(sorted(self.command_registry.commands))
         self.ai_interpreter = AIInterpreter(api_key=ai_api_key)
+        
+        # Built-in commands handled by the terminal itself, called with args
+        self._builtins = {
+            'exit': lambda args: ("exit", ""),
+            'help': lambda args: self._show_help(),
+            'history': lambda args: self._show_history(),
+            'clear': lambda args: (True, "\033[2J\033[H"),  # Clear screen
+        }
         self.history_file = os.path.expanduser("~/.pyterminal_history")
+        
+        # Directory listings for completion, keyed by path: (mtime, entries)
+        self._dir_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._completion_options: List[str] = []
         self._setup_readline()
         
+    @property
+    def current_dir(self) -> str:
+        """Directory the terminal is working in"""
+        return self._current_dir
+    
+    @current_dir.setter
+    def current_dir(self, path: str):
+        self._current_dir = path
+        # Only recompute the prompt's directory name when the directory changes
+        self._current_dir_name = os.path.basename(path) or '~'
+    
     def _setup_readline(self):
         """Setup readline for command history and auto-completion"""
         if not HAS_READLINE:
@@ -46,37 +72,54 @@ class PyTerminal:
         readline.parse_and_bind("tab: complete")
         
         # Set history length
-        readline.set_history_length(1000)
+        readline.set_history_length(HISTORY_LENGTH)
+        
+        # Entries already in the file; only later ones need saving
+        self._history_base_len = readline.get_current_history_length()
     
     def _completer(self, text: str, state: int) -> Optional[str]:
         """Auto-completion function for readline"""
         if not HAS_READLINE:
             return None
             
-        options = []
-        
-        # Get available commands
-        commands = list(self.command_registry.commands.keys())
-        options.extend([cmd for cmd in commands if cmd.startswith(text)])
-        
-        # Get files/directories in current directory
-        try:
-            files = os.listdir(self.current_dir)
+        # readline calls with state 0, 1, 2, ... for the same text, so only
+        # build the candidate list on the first call
+        if state == 0:
+            options = []
+            
+            # Get available commands
+            options.extend([cmd for cmd in self._command_names if cmd.startswith(text)])
+            
+            # Get files/directories in current directory
+            files = self._list_dir(self.current_dir)
             options.extend([f for f in files if f.startswith(text)])
-        except OSError:
-            pass
+            
+            self._completion_options = options
         
         # Return the option at the given state
-        if state < len(options):
-            return options[state]
+        if state < len(self._completion_options):
+            return self._completion_options[state]
         return None
     
+    def _list_dir(self, path: str) -> List[str]:
+        """List a directory, reusing the cached entries until its mtime changes"""
+        try:
+            mtime = os.stat(path).st_mtime
+            cached = self._dir_cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            
+            with os.scandir(path) as it:
+                entries = [entry.name for entry in it]
+        except OSError:
+            return []
+        
+        self._dir_cache[path] = (mtime, entries)
+        return entries
+    
     def _get_prompt(self) -> str:
         """Generate the terminal prompt"""
-        username = os.getenv('USERNAME', 'user')
-        hostname = os.getenv('COMPUTERNAME', 'pyterminal')
-        current_dir_name = os.path.basename(self.current_dir) or '~'
-        return f"{username}@{hostname}:{current_dir_name}$ "
+        return f"{self._username}@{self._hostname}:{self._current_dir_name}$ "
     
     def _save_history(self):
         """Save command history to file"""
@@ -84,7 +127,15 @@ class PyTerminal:
             return
             
         try:
-            readline.write_history_file(self.history_file)
+            # Append just this session's commands; append_history_file also
+            # truncates the file to HISTORY_LENGTH entries
+            if (hasattr(readline, 'append_history_file')
+                    and os.path.exists(self.history_file)):
+                new_items = readline.get_current_history_length() - self._history_base_len
+                if new_items > 0:
+                    readline.append_history_file(new_items, self.history_file)
+            else:
+                readline.write_history_file(self.history_file)
         except OSError:
             pass
     
@@ -92,46 +143,48 @@ class PyTerminal:
         """
         Process a command line and return (success, output)
         """
-        if not command_line.strip():
+        # Split command and arguments; split() already skips surrounding
+        # whitespace, so no separate strip() pass is needed
+        parts = command_line.split()
+        if not parts:
             return True, ""
         
-        # Check for AI interpretation first
-        if command_line.strip().startswith('ai '):
-            ai_command = command_line[3:].strip()
+        # Check for AI interpretation first; only the left side matters for
+        # the prefix, and the slice avoids a method call per command
+        stripped = command_line.lstrip()
+        if stripped[:3] == 'ai ' and len(parts) > 1:
+            ai_command = stripped[3:].strip()
             try:
                 interpreted_commands = self.ai_interpreter.interpret(ai_command)
                 if interpreted_commands:
-                    output = []
+                    # Build the transcript in one buffer rather than a list
+                    # of temporary strings joined at the end
+                    output = io.StringIO()
                     for cmd in interpreted_commands:
                         success, cmd_output = self._process_command(cmd)
-                        output.append(f"$ {cmd}")
-                        output.append(cmd_output)
-                    return True, "\n".join(output)
+                        if output.tell():
+                            output.write("\n")
+                        output.write("$ ")
+                        output.write(cmd)
+                        output.write("\n")
+                        output.write(cmd_output)
+                    return True, output.getvalue()
                 else:
                     return False, "Could not interpret the command"
             except Exception as e:
                 return False, f"AI interpretation error: {str(e)}"
         
-        # Split command and arguments
-        parts = command_line.strip().split()
-        if not parts:
-            return True, ""
-        
+        # Only the command name is case-insensitive
         command = parts[0].lower()
-        args = parts[1:] if len(parts) > 1 else []
+        args = parts[1:]
         
         # Handle built-in commands
-        if command == "exit":
-            return "exit", ""
-        elif command == "help":
-            return self._show_help()
-        elif command == "history":
-            return self._show_history()
-        elif command == "clear":
-            return True, "\033[2J\033[H"  # Clear screen
-        else:
-            # Execute command through registry
-            return self.command_registry.execute(command, args, self.current_dir)
+        builtin = self._builtins.get(command)
+        if builtin is not None:
+            return builtin(args)
+        
+        # Execute command through registry
+        return self.command_registry.execute(command, args, self.current_dir)
     
     def _show_help(self) -> Tuple[bool, str]:
         """Show help information"""
@@ -40,16 +40,19 @@ def test_ai_commands():
     print(f"API URL: {ai.api_url}")
     print()
     
-    for i, command in enumerate(test_commands, 1):
+    # interpret_many batches the commands into as few LLM calls as possible
+    try:
+        results = ai.interpret_many(test_commands)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return
+    
+    for i, (command, result) in enumerate(zip(test_commands, results), 1):
         print(f"{i:2d}. Testing: '{command}'")
-        try:
-            result = ai.interpret(command)
-            if result:
-                print(f"    ✅ Generated: {result}")
-            else:
-                print(f"    ❌ No commands generated")
-        except Exception as e:
-            print(f"    ❌ Error: {str(e)}")
+        if result:
+            print(f"    ✅ Generated: {result}")
+        else:
+            print(f"    ❌ No commands generated")
         print()
     
     print("=" * 35)
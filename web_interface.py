@@ -8,42 +8,34 @@ from flask import Flask, render_template, request, jsonify
 import os
 import sys
 from terminal import PyTerminal
-import threading
-import queue
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
 app = Flask(__name__)
 
 # Global terminal instance
 terminal = PyTerminal()
-command_queue = queue.Queue()
-output_queue = queue.Queue()
 
-def terminal_worker():
-    """Background worker to process commands"""
-    while True:
-        try:
-            command = command_queue.get(timeout=1)
-            if command == "EXIT":
-                break
-            
-            success, output = terminal._process_command(command)
-            output_queue.put({
-                'success': success,
-                'output': output,
-                'command': command
-            })
-        except queue.Empty:
-            continue
-        except Exception as e:
-            output_queue.put({
-                'success': False,
-                'output': f"Error: {str(e)}",
-                'command': command
-            })
+# Commands are I/O bound (disk, LLM round trips), so match the server's thread count
+WEB_THREADS = 16
 
-# Start background worker
-worker_thread = threading.Thread(target=terminal_worker, daemon=True)
-worker_thread.start()
+# Commands run on a shared pool; each request waits only for its own result
+executor = ThreadPoolExecutor(max_workers=WEB_THREADS)
+
+# Seconds a request waits for its command (AI commands include LLM round trips)
+COMMAND_TIMEOUT = float(os.getenv('PYTERMINAL_COMMAND_TIMEOUT', '30'))
+
+def run_command(command):
+    """Run a single command and build its JSON result"""
+    try:
+        success, output = terminal._process_command(command)
+    except Exception as e:
+        success, output = False, f"Error: {str(e)}"
+    
+    return {
+        'success': success,
+        'output': output,
+        'command': command
+    }
 
 @app.route('/')
 def index():
@@ -59,15 +51,16 @@ def execute_command():
     if not command.strip():
         return jsonify({'success': False, 'output': 'No command provided'})
     
-    # Add command to queue
-    command_queue.put(command)
+    future = executor.submit(run_command, command)
     
     # Wait for output
     try:
-        result = output_queue.get(timeout=5)
-        return jsonify(result)
-    except queue.Empty:
-        return jsonify({'success': False, 'output': 'Command timeout'})
+        return jsonify(future.result(timeout=COMMAND_TIMEOUT))
+    except TimeoutError:
+        # A command still queued must not run after the client was told it timed out
+        if future.cancel():
+            return jsonify({'success': False, 'output': 'Command timeout (not started)'})
+        return jsonify({'success': False, 'output': 'Command timeout (still running)'})
 
 @app.route('/status')
 def status():
@@ -78,175 +71,13 @@ def status():
     })
 
 if __name__ == '__main__':
-    # Create templates directory if it doesn't exist
-    os.makedirs('templates', exist_ok=True)
-    
-    # Create the HTML template
-    html_template = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>PyTerminal Web Interface</title>
-    <style>
-        body {
-            font-family: 'Courier New', monospace;
-            background-color: #1e1e1e;
-            color: #ffffff;
-            margin: 0;
-            padding: 20px;
-        }
-        .terminal {
-            background-color: #000000;
-            border: 1px solid #333;
-            border-radius: 5px;
-            padding: 20px;
-            min-height: 400px;
-            overflow-y: auto;
-        }
-        .output {
-            white-space: pre-wrap;
-            margin-bottom: 10px;
-        }
-        .input-container {
-            display: flex;
-            align-items: center;
-        }
-        .prompt {
-            color: #00ff00;
-            margin-right: 10px;
-        }
-        .command-input {
-            background: transparent;
-            border: none;
-            color: #ffffff;
-            font-family: 'Courier New', monospace;
-            font-size: 14px;
-            outline: none;
-            flex: 1;
-        }
-        .error {
-            color: #ff4444;
-        }
-        .success {
-            color: #44ff44;
-        }
-        .help {
-            color: #4444ff;
-        }
-    </style>
-</script>
-</head>
-<body>
-    <h1>PyTerminal Web Interface</h1>
-    <div class="terminal" id="terminal">
-        <div class="output">Welcome to PyTerminal Web Interface!</div>
-        <div class="output">Type 'help' for available commands or 'exit' to quit</div>
-        <div class="output">----------------------------------------</div>
-    </div>
-    
-    <div class="input-container">
-        <span class="prompt" id="prompt">user@pyterminal:~$</span>
-        <input type="text" class="command-input" id="commandInput" autofocus>
-    </div>
-
-    <script>
-        const terminal = document.getElementById('terminal');
-        const commandInput = document.getElementById('commandInput');
-        const prompt = document.getElementById('prompt');
-        
-        let commandHistory = [];
-        let historyIndex = -1;
-        
-        // Load initial status
-        loadStatus();
-        
-        function loadStatus() {
-            fetch('/status')
-                .then(response => response.json())
-                .then(data => {
-                    prompt.textContent = data.prompt;
-                });
-        }
-        
-        function addOutput(text, className = '') {
-            const output = document.createElement('div');
-            output.className = `output ${className}`;
-            output.textContent = text;
-            terminal.appendChild(output);
-            terminal.scrollTop = terminal.scrollHeight;
-        }
-        
-        function executeCommand(command) {
-            if (!command.trim()) return;
-            
-            // Add to history
-            commandHistory.unshift(command);
-            if (commandHistory.length > 100) {
-                commandHistory.pop();
-            }
-            historyIndex = -1;
-            
-            // Show command
-            addOutput(`$ ${command}`);
-            
-            // Execute command
-            fetch('/execute', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({command: command})
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.output) {
-                    const className = data.success ? 'success' : 'error';
-                    addOutput(data.output, className);
-                }
-                
-                // Update prompt
-                loadStatus();
-            })
-            .catch(error => {
-                addOutput(`Error: ${error.message}`, 'error');
-            });
-        }
-        
-        commandInput.addEventListener('keydown', function(e) {
-            if (e.key === 'Enter') {
-                const command = commandInput.value.trim();
-                if (command) {
-                    executeCommand(command);
-                    commandInput.value = '';
-                }
-            } else if (e.key === 'ArrowUp') {
-                e.preventDefault();
-                if (historyIndex < commandHistory.length - 1) {
-                    historyIndex++;
-                    commandInput.value = commandHistory[historyIndex];
-                }
-            } else if (e.key === 'ArrowDown') {
-                e.preventDefault();
-                if (historyIndex > 0) {
-                    historyIndex--;
-                    commandInput.value = commandHistory[historyIndex];
-                } else if (historyIndex === 0) {
-                    historyIndex = -1;
-                    commandInput.value = '';
-                }
-            }
-        });
-        
-        // Auto-focus input
-        commandInput.focus();
-    </script>
-</body>
-</html>'''
-    
-    with open('templates/index.html', 'w') as f:
-        f.write(html_template)
-    
     print("Starting PyTerminal Web Interface...")
     print("Open your browser and go to: http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    
+    # Prefer a production WSGI server when available
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=5000, threads=WEB_THREADS)